@@ -5,13 +5,18 @@
 
 __all__ = ["pprint", "read_log"]
 
+import collections
+import copy
 import datetime as dt
 import json
-import re
-from typing import Optional, Type
+import os
+from typing import TYPE_CHECKING, Optional, Type
 
 import numpy as np
-import tqdm
+
+# tqdm is only needed for type annotations, and is not a dependency
+if TYPE_CHECKING:
+    import tqdm
 
 # For pprint to accept NaN values
 NOVALUE = np.iinfo(np.int64).min
@@ -20,7 +25,7 @@ def pprint(
         *values,
         width: int = 7,
         out: Optional[str] = None,
-        pbar: Optional[Type[tqdm.tqdm]] = None,
+        pbar: Optional[Type["tqdm.tqdm"]] = None,
         stdout: bool = True,
 ):
     """Prints right-aligned columns of fixed width.
@@ -177,30 +182,43 @@ def read_log(filename: str, schema: list, merge: bool = False):
         _maps.append(_map)
 
     # Read file
+    # Values are appended directly to per-column lists, avoiding a second
+    # transposition pass over all rows.
     is_header_logged = False
     _headers = []
-    _data = []
+    _columns = [[] for _map in _maps if _map is not None]
+    _ncolumns = len(_columns)  # shortest row length
+    _nrows = 0
     print(_maps)
     with open(filename, "r") as f:
         for row_str in f:
-            # Squash all intermediate spaces
-            row = re.sub(r"\s+", " ", row_str.strip()).split(" ")
+            # Squash all intermediate whitespace
+            row = row_str.split()
+            if not row:  # skip blank lines
+                continue
             try:
                 # Equivalent to Pandas's 'applymap'
                 # Note this cannot be run in parallel due to 'convert_time' implementation
-                row = [f(v) for f, v in zip(_maps, row) if f is not None]
-                _data.append(row)
+                values = [f(v) for f, v in zip(_maps, row) if f is not None]
             except:
                 # If fails, assume is string header
                 if not is_header_logged:
                     _headers = [v for f, v in zip(_maps, row) if f is not None]
                     is_header_logged = True
+                continue
+            for column, value in zip(_columns, values):
+                column.append(value)
+            _ncolumns = min(_ncolumns, len(values))
+            _nrows += 1
 
     if not is_header_logged:
         raise ValueError("Logfile does not contain a header.")
 
     # Merge headers
-    _data = list(zip(*_data))
+    # Columns not present in every row are dropped
+    if not _nrows:
+        _ncolumns = 0
+    _data = [tuple(column) for column in _columns[:_ncolumns]]
     _items = tuple(zip(_headers, _data))
     return dict(_items)
 
@@ -228,20 +246,61 @@ def data_decoder(dct):
         return np.array(list(map(_str2dt, dct["_dt_np"])))
     return dct
 
+FILECACHE_MEMSIZE = 16
+
 def filecache(func):
     # TODO: Raise warning if 'cache' keyword already defined.
+
+    # In-memory layer in front of the disk cache, keyed by cache path.
+    # Decoded contents are stored together with the file modification time
+    # and size, so that modified or deleted cache files invalidate the entry,
+    # including on filesystems with coarse timestamps. Copies are returned,
+    # since callers may mutate the result.
+    # Oldest entries are evicted beyond 'FILECACHE_MEMSIZE'.
+    _mem = collections.OrderedDict()
+
+    def _remember(cache, signature, data):
+        _mem[cache] = (signature, data)
+        _mem.move_to_end(cache)
+        if len(_mem) > FILECACHE_MEMSIZE:
+            _mem.popitem(last=False)
+
     def helper(*args, cache=None, **kwargs):
         nonlocal func
+        if cache is None:  # no cache file, compute directly
+            return func(*args, **kwargs)
+
         try:
-            with open(cache, "r") as f:
-                result = json.load(f, object_hook=data_decoder)
-            return result
+            stat = os.stat(cache)
+        except OSError:
+            stat = None
+            _mem.pop(cache, None)
+
+        # Only attempt loading if cache file is present and non-empty
+        if stat is not None and stat.st_size > 0:
+            signature = (stat.st_mtime_ns, stat.st_size)
+            prev_signature, data = _mem.get(cache, (None, None))
+            if prev_signature == signature:
+                _mem.move_to_end(cache)
+                return copy.deepcopy(data)
+
+            try:
+                with open(cache, "r") as f:
+                    data = json.load(f, object_hook=data_decoder)
+                _remember(cache, signature, data)
+                return copy.deepcopy(data)
 
-        except:
-            print("Cache loading failed")
+            except:
+                print("Cache loading failed")
         result = func(*args, **kwargs)
+        encoded = json.dumps(result, cls=DataEncoder)
         with open(cache, "w") as f:
-            json.dump(result, f, cls=DataEncoder)
+            f.write(encoded)
+
+        # Store decoded form, to match results loaded from disk
+        data = json.loads(encoded, object_hook=data_decoder)
+        stat = os.stat(cache)
+        _remember(cache, (stat.st_mtime_ns, stat.st_size), data)
         return result
     return helper
 
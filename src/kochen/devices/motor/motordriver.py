@@ -8,6 +8,16 @@ def execute_twice(f):
         return result
     return helper
 
+# Pre-encoded motor commands
+_CMD_SETVOLT = b"setvolt"
+_CMD_INTERPOL = b"interpol"
+_CMD_SETSPEED = b"setspeed"
+_CMD_ON = b"on"
+_CMD_OFF = b"off"
+_CMD_ZERO = b"zero"
+_CMD_POS = b"POS?"
+_CMD_GO = b"go"
+
 class MotorDriver:
 
     def __init__(self, path):
@@ -24,10 +34,14 @@ class MotorController:
         channel = int(channel)
         assert channel in [0,1]
         self.channel = channel
+        self._channel_b = str(channel).encode()  # pre-encoded for commands
         self.steps_per_revolution = steps_per_revolution
 
     def _write(self, *args):
-        self.driver._com.write("{};".format(" ".join(map(str, args))).encode())
+        """Writes space-delimited command, arguments can be str or bytes."""
+        self.driver._com.write(b" ".join(
+            a if isinstance(a, bytes) else str(a).encode() for a in args
+        ) + b";")
 
     def _read(self):
         return self.driver._com.readline().decode().strip()
@@ -45,71 +59,85 @@ class MotorController:
     #######################################
 
     def initialize(self):
-        self._write("setvolt", self.channel, 1.5)
-        self._write("interpol", self.channel, 2)
-        self._write("setspeed", self.channel, 170)
+        self._write(_CMD_SETVOLT, self._channel_b, 1.5)
+        self._write(_CMD_INTERPOL, self._channel_b, 2)
+        self._write(_CMD_SETSPEED, self._channel_b, 170)
         #self.set_zero()
         self.set_on()
 
     @execute_twice
     def set_on(self):
-        self._write("on", self.channel)
+        self._write(_CMD_ON, self._channel_b)
 
     @execute_twice
     def set_off(self):
-        self._write("off", self.channel)
+        self._write(_CMD_OFF, self._channel_b)
 
-    @execute_twice
     def set_zero(self):
         # Somehow needs four times...
-        self._write("zero", self.channel)
-        self._write("zero", self.channel)
+        self._write(_CMD_ZERO, self._channel_b)
+        self._write(_CMD_ZERO, self._channel_b)
+        self._write(_CMD_ZERO, self._channel_b)
+        self._write(_CMD_ZERO, self._channel_b)
 
     def get_position(self):
         """
         Multiple position calls needed, due to occasional readout errors,
         e.g. [..., 190, 193, 196, 0, 202, ...]. First readout clears
         remnant buffer, second and third does a position verification.
+
+        The three queries are pipelined, i.e. all written before the
+        responses are read, to avoid waiting on three serial round-trips.
+        The input buffer is cleared before each attempt, since replies to
+        a previous attempt may arrive late, e.g. after a read timeout.
+
+        Raises:
+            RuntimeError: Position could not be verified after retries.
         """
-        try:
-            position1 = int(self._rwrite("POS?", self.channel))
-            position2 = int(self._rwrite("POS?", self.channel))
-            position3 = int(self._rwrite("POS?", self.channel))
-            if position2 == position3:
-                return position3
-        except:
-            pass
-        return self.get_position() # restart if wrong command
+        for _ in range(20):  # retry if wrong command
+            try:
+                self.driver._com.reset_input_buffer()  # drop stale replies
+                for _ in range(3):
+                    self._write(_CMD_POS, self._channel_b)
+                readouts = [self._read() for _ in range(3)]
+                position1, position2, position3 = map(int, readouts)
+                if position2 == position3:
+                    return position3
+            except (ValueError, serial.SerialException):
+                continue
+        raise RuntimeError("Motor position unreadable")
 
-    @execute_twice
     def get_position_degree(self):
-        pos = self.get_position()
-        # if pos is None: return None
-        return self.step2deg(pos)
+        # 'get_position' already verifies the readout
+        return self.step2deg(self.get_position())
 
     @execute_twice
     def set_position(self, position):
         assert isinstance(position, int)
-        self._write("go", self.channel, position)
+        self.driver._com.write(
+            _CMD_GO + b" " + self._channel_b + b" " + str(position).encode() + b";"
+        )
 
     def set_position_blocking(self, position) -> None:
-        """ Blocking """
+        """ Blocking
+
+        Position is polled back-to-back, since each readout already blocks
+        on the serial round-trips, instead of sleeping between polls.
+        """
         self.set_position(position)
         timeout = 10
-        deadline = time.time() + timeout
+        deadline = time.monotonic() + timeout
         fail_count = 0
         while True:
             if self.get_position() == position:
                 break
             if fail_count > 3:
-                raise RuntimeException("Motor unwilling to move...")
-            if time.time() > deadline:
-                deadline = time.time() + timeout
+                raise RuntimeError("Motor unwilling to move...")
+            if time.monotonic() > deadline:
+                deadline = time.monotonic() + timeout
                 self.set_position(position)
                 fail_count += 1
-                continue
-            time.sleep(.1)
 
-    @execute_twice
     def set_position_degree(self, degree):
+        # 'set_position' already sends the command twice
         self.set_position(self.deg2step(degree))
@@ -39,7 +39,8 @@ class FileDict:
         if not fp.exists():
             fp.touch()
             with open(filepath, "wb") as f:
-                pickle.dump({}, f)
+                pickle.dump({}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        super().__setattr__("_filepath", filepath)
         with open(filepath, "rb") as f:
             try:
                 super().__setattr__("_data", pickle.load(f))
@@ -53,8 +54,8 @@ class FileDict:
 
     def __setattr__(self, name, value):
         self._data[name] = value
-        with open(filepath, "wb") as f:
-            pickle.dump(self._data, f) # inefficient for large operations
+        with open(self._filepath, "wb") as f:
+            pickle.dump(self._data, f, protocol=pickle.HIGHEST_PROTOCOL) # inefficient for large operations
 
     def __delattr__(self, name):
         del self._data[name]
@@ -64,12 +64,17 @@ def parse_args_or_help(parser, ignore_unknown=False):
         args = parser.parse_args()
 
     # Check whether options have been supplied, and print help otherwise
-    args_sources = parser.get_source_to_settings_dict().keys()
-    config_supplied = any(map(lambda x: x.startswith("config_file"), args_sources))
-    if getattr(args, "help", None) or \
-            (len(sys.argv) == 1 and not config_supplied):
+    # Config sources are only inspected when no arguments are supplied,
+    # since walking the parser settings is non-trivial.
+    if getattr(args, "help", None):
         parser.print_help(sys.stderr)
         sys.exit(1)
+    elif len(sys.argv) == 1:
+        args_sources = parser.get_source_to_settings_dict().keys()
+        config_supplied = any(map(lambda x: x.startswith("config_file"), args_sources))
+        if not config_supplied:
+            parser.print_help(sys.stderr)
+            sys.exit(1)
 
     return args
 
@@ -107,13 +112,48 @@ def guarantee_path(path, type=None):
         os.mkfifo(str(path))
     return path
 
+def guarantee_paths(paths, type=None):
+    """Batched version of 'guarantee_path', returns list of wrappers to Path.
+
+    Paths are grouped by parent directory, so that each directory is listed
+    only once with 'os.scandir'. The directory entries carry cached file type
+    information, which avoids an additional 'stat' call per path. Paths that
+    do not exist, symlinks and pipes are deferred to 'guarantee_path'.
+    """
+    assert type in (None, "f", "d", "p")  # file, directory, pipe
+    paths = [pathlib.Path(path) for path in paths]
+
+    # Group by parent directory
+    groups = {}
+    for path in paths:
+        groups.setdefault(path.parent, []).append(path)
+
+    for parent, group in groups.items():
+        try:
+            with os.scandir(parent) as it:
+                entries = {entry.name: entry for entry in it}
+        except OSError:  # e.g. parent does not exist
+            entries = {}
+
+        for path in group:
+            entry = entries.get(path.name)
+            if entry is None or type == "p" or entry.is_symlink():
+                guarantee_path(path, type)
+            elif type == "f" and not entry.is_file():
+                raise ValueError(f"Path '{path}' is not a file")
+            elif type == "d" and not entry.is_dir():
+                raise ValueError(f"Path '{path}' is not a directory")
+    return paths
+
+RE_NEWLINES = re.compile(r"\n+")
+
 def parse_docstring_description(docstring):
     placeholder = "~~~PLACEHOLDER~~~"
     # Remove all changelog information
     d = docstring.partition("Changelog:")[0]
 
     # Replace all newlines except the first
-    d = re.sub(r"\n+", placeholder, d, count=1)
-    d = re.sub(r"\n+", " ", d)
-    d = re.sub(placeholder, "\n\n", d)
+    d = RE_NEWLINES.sub(placeholder, d, count=1)
+    d = RE_NEWLINES.sub(" ", d)
+    d = d.replace(placeholder, "\n\n")
     return d
@@ -16,6 +16,10 @@ MAPPING_DICT = {
     "~~~CURRENTDATE~~~": dt.datetime.now().strftime("%Y-%m-%d"),
 }
 
+# Substitution performed directly on bytes to avoid a decode/encode round-trip
+_MAPPING_BYTES = {k.encode(): str(v).encode() for k, v in MAPPING_DICT.items()}
+_PATTERN_BYTES = re.compile(b"|".join(map(re.escape, _MAPPING_BYTES)))
+
 # Create boilerplate code, the original purpose of this module
 def main():
 
@@ -45,14 +49,9 @@ def main():
         print(f"Template '{template_type}' not found, falling back to default.")
         print(f"Available templates: {template_names}")
         src_fpath = src_dpath / f"{TEMPLATE_DEFAULT}.py"
-    with open(src_fpath, "r") as f:
-        filecontents = f.read()
-
-    for k, v in MAPPING_DICT.items():
-        filecontents = re.sub(k, str(v), filecontents)
-
-    with open(filepath, "w") as f:
-        f.write(filecontents)
+    data = src_fpath.read_bytes()
+    data = _PATTERN_BYTES.sub(lambda m: _MAPPING_BYTES[m.group(0)], data)
+    filepath.write_bytes(data)
     print(f"File '{filepath}' successfully written.")
 
     # Write default configuration file as well
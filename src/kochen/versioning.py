@@ -85,15 +85,14 @@ References:
     [1]: https://stackoverflow.com/questions/53564301/insert-docstring-attributes-in-a-python-file
 """
 
-import ast
 import importlib.metadata
+import os
 import re
 import sys
-from functools import partial
+import sysconfig
+from functools import lru_cache, partial
 from typing import Optional
 
-from sortedcontainers import SortedDict  # for O(logN) bisection methods
-
 from kochen.logging import get_logger
 
 __all__ = [
@@ -105,17 +104,57 @@ logger = get_logger(__name__, level="info")
 
 TARGET_LIBRARY = "kochen"
 MAX_IMPORTSEARCH_DEPTH = 3
-SEARCHED_MODULES = set()  # cache visited modules, since imports are also a DAG
-RE_VERSION_STRING = re.compile(r"#.*\sv([0-9]+)\.?([0-9]+)?\.?([0-9]+)?")
-
+_DIGITS = "0123456789"
+RE_VERSION_LIB = re.compile(r"([0-9]+)(?:\.([0-9]+))?(?:\.([0-9]+))?")
+
+# Matches lines directly importing the target library, e.g. 'import kochen',
+# 'import kochen.common as c', 'from kochen import common'
+# Only unindented lines are matched, since module-level imports are searched.
+RE_IMPORT_TARGET = re.compile(
+    rf"^(?:import[ \t]+{TARGET_LIBRARY}(?:[ \t]*[#.,;\\]|[ \t]+as[ \t]|[ \t]*$)"
+    rf"|from[ \t]+{TARGET_LIBRARY}[ \t.])",
+    re.MULTILINE,
+)
+SEARCHED_PATHS = set()  # cache visited files, since imports are also a DAG
+_AST_CACHE = {}  # cache file AST across search depths
+
+# Third-party libraries which will not import the target library, skipped
+# during search by name.
+SKIPPED_MODULES = frozenset({
+    "numpy", "scipy", "pandas", "matplotlib", "tqdm", "serial",
+    "configargparse", "IPython", "ipykernel", "jupyter_client",
+    "setuptools", "pip", "pytest", "_pytest",
+})
+
+# Stdlib modules are skipped by their resolved file location instead of name,
+# so that local modules shadowing stdlib names are still searched. Note that
+# site-packages may be located within the stdlib directory.
+_paths = sysconfig.get_paths()
+_STDLIB_DIRS = tuple({os.path.join(_paths[k], "") for k in ("stdlib", "platstdlib")})
+_SITE_DIRS = tuple({os.path.join(_paths[k], "") for k in ("purelib", "platlib")})
+del _paths
+
+def _is_stdlib(path):
+    return path.startswith(_STDLIB_DIRS) and not path.startswith(_SITE_DIRS)
+
+@lru_cache(maxsize=256)  # version strings are mostly shared across functions
 def _version_str2tuple(version_str):
+    # Fast path for release versions, e.g. '0.2024.1'
     major, *remainder = version_str.split(".")
     minor = patch = 0
     if len(remainder) > 0:
         minor = remainder[0]
         if len(remainder) > 1:
             patch = remainder[1]
-    return tuple(map(int, (major,minor,patch)))
+    try:
+        return tuple(map(int, (major,minor,patch)))
+    except ValueError:
+        pass
+
+    # Fallback for versions with other segments, e.g. '0.2024.1rc1'
+    if (result := RE_VERSION_LIB.match(version_str)) is None:
+        raise ValueError(f"Invalid version string '{version_str}'")
+    return tuple(int(v) if v else 0 for v in result.groups())
 
 def _version_tuple2str(version_tuple):
     return ".".join(map(str, version_tuple))
@@ -124,6 +163,56 @@ def _version_tuple2str(version_tuple):
 installed_version_str = importlib.metadata.version(TARGET_LIBRARY)
 installed_version = _version_str2tuple(installed_version_str)
 
+# Reverse index of module filepaths to module names, built once per search
+# since loaded modules do not change during the search
+_FILE_TO_NAME = {}
+
+# Node types for dispatch by exact type name, which avoids the MRO traversal
+# in 'isinstance' checks, as well as importing 'ast' until the search runs.
+# Compound statements may contain module-level imports, e.g. guarded imports.
+_IMPORT_TYPES = {"Import", "ImportFrom"}
+_COMPOUND_STATEMENTS = {"If", "Try", "TryStar", "ExceptHandler", "With"}
+
+def _iter_imports(body):
+    """Yields import statements found at module level.
+
+    Compound statements such as 'if' and 'try' blocks are traversed, but
+    function and class definitions are skipped.
+    """
+    for node in body:
+        t = type(node).__name__
+        if t in _IMPORT_TYPES:
+            yield node
+        elif t in _COMPOUND_STATEMENTS:
+            for field in ("body", "handlers", "orelse", "finalbody"):
+                yield from _iter_imports(getattr(node, field, ()))
+
+def _get_importline(source, lineno):
+    """Returns line number and content of the line ending the statement.
+
+    Lines concatenated with '\\' are traversed until the last line of the
+    statement starting at 'lineno' (1-indexed), without splitting the full
+    source into lines.
+    """
+    start = 0
+    for _ in range(lineno-1):
+        start = source.index("\n", start) + 1
+    while True:
+        end = source.find("\n", start)
+        if end == -1:
+            return lineno, source[start:]
+        line = source[start:end]
+        if not line.endswith("\\"):
+            return lineno, line
+        start = end + 1
+        lineno += 1
+
+@lru_cache(maxsize=64)
+def _read(path):
+    """Returns file contents, cached for the duration of the search."""
+    with open(path) as file:
+        return file.read()
+
 def _search_importline(path, depth=0, max_depth=MAX_IMPORTSEARCH_DEPTH):
     """Search for the line reference to import of target library.
 
@@ -145,7 +234,11 @@ def _search_importline(path, depth=0, max_depth=MAX_IMPORTSEARCH_DEPTH):
     cached library instead). The use of the `ast` module for searching is
     nominally ideal since the code traversal in running code should be close
     to the manual traversal of the syntax tree, and import statements which
-    are part of comments are safely ignored.
+    are part of comments are safely ignored. Only module-level imports are
+    searched, since function and class bodies need not be traversed.
+
+    Returns the importing module name, filepath, line number and the
+    content of the line where the version information is expected.
 
     Code adapted from an implementation from StackOverflow [1].
 
@@ -162,22 +255,43 @@ def _search_importline(path, depth=0, max_depth=MAX_IMPORTSEARCH_DEPTH):
     if depth > max_depth:
         return
 
-    # Parse file as AST
+    # Parse file as AST, reusing results from shallower searches
+    # Source is retained for retrieving the import line later
     try:
-        with open(path) as file:
-            root = ast.parse(file.read(), path)
+        source = _read(path)
     except UnicodeDecodeError:  # ignore file if cannot decode properly
         return
 
-    for node in ast.walk(root):
-
-        # Process node only if they are import statements
-        if isinstance(node, ast.Import):
-            module = None
-        elif isinstance(node, ast.ImportFrom):
-            module = node.module
-        else:
-            continue
+    if (root := _AST_CACHE.get(path)) is None:
+        if (idx := source.find(TARGET_LIBRARY)) != -1:
+            # Direct imports of the target library can be located by regex
+            # without parsing, if it is the first mention of the library and
+            # no string literal possibly spanning lines precedes it, e.g.
+            # docstring examples. Parsing remains as fallback for other
+            # forms, e.g. 'import os, kochen', and for mentions preceding
+            # the import.
+            match = RE_IMPORT_TARGET.search(source)
+            if match is not None \
+                    and source.rfind("\n", 0, idx) + 1 == match.start() \
+                    and source.find('"""', 0, match.start()) == -1 \
+                    and source.find("'''", 0, match.start()) == -1:
+                name = _FILE_TO_NAME.get(path)
+                lineno = source.count("\n", 0, match.start()) + 1
+                lineno, line = _get_importline(source, lineno)
+                return name, path, lineno, line
+
+        # Imports are not traversed further at maximum depth, so files that
+        # do not reference the target library can skip parsing entirely
+        elif depth == max_depth:
+            return
+        import ast  # deferred until search is needed
+        root = ast.parse(source, path)
+        _AST_CACHE[path] = root
+
+    for node in _iter_imports(root.body):
+
+        # Nodes are guaranteed to be import statements
+        module = getattr(node, "module", None)  # 'ast.ImportFrom' only
 
         # Only need to identify the base library of the module
         for n in node.names:
@@ -189,21 +303,13 @@ def _search_importline(path, depth=0, max_depth=MAX_IMPORTSEARCH_DEPTH):
             # Note: 'node.end_lineno' is only available from Python 3.8 [2]
             if basemodule == TARGET_LIBRARY:
                 # Find importing module name
-                for name, module in sys.modules.items():
-                    if hasattr(module, "__file__") and module.__file__ == path:
-                        break
-                lineno = node.lineno  # 1-indexed
-                with open(path) as file:
-                    lines = file.readlines()
-                while lines[lineno-1].endswith("\\\n"):
-                    lineno += 1
-                return name, path, lineno
-
-            # Cache modules
-            if targetmodule in SEARCHED_MODULES:
+                name = _FILE_TO_NAME.get(path)
+                lineno, line = _get_importline(source, node.lineno)
+                return name, path, lineno, line
+
+            # Ignore known third-party libraries
+            if basemodule in SKIPPED_MODULES:
                 continue
-            else:
-                SEARCHED_MODULES.add(targetmodule)
 
             # Ignore modules that have not been imported, or if not a file,
             # e.g. stdlib or C extensions
@@ -213,25 +319,50 @@ def _search_importline(path, depth=0, max_depth=MAX_IMPORTSEARCH_DEPTH):
             except (KeyError, AttributeError):
                 continue
 
+            # Ignore stdlib, and cache files to avoid searching modules
+            # imported under multiple names more than once
+            if target is None or target in SEARCHED_PATHS or _is_stdlib(target):
+                continue
+            SEARCHED_PATHS.add(target)
+
             # Continue traversal and terminate immediately upon completion
             result = _search_importline(target, depth+1, max_depth)
             if result is not None:
                 return result
 
 def _parse_importline(line, installed_version):
-    """Extracts requested version from the line."""
-    if "#" not in line or (result := RE_VERSION_STRING.search(line)) is None:
+    """Extracts requested version from the line.
+
+    The version is the last whitespace-delimited token in the comment of the
+    form 'vMAJOR[.MINOR[.PATCH]]', e.g. 'import kochen  # v0.2024.1'.
+    """
+    # Pinned versions always have a comment containing 'v'
+    if (idx := line.find("#")) == -1 or line.find("v", idx) == -1:
         return installed_version
 
-    # Force lowest minor/patch for most conservative compatibility
-    major, minor, patch =  result.groups()
-    if minor is None: minor = 0
-    if patch is None: patch = 0
-    requested_version = tuple(map(int, (major,minor,patch)))
-    return requested_version
+    for token in reversed(line[idx:].split()):
+        if token[:1] != "v" or not "0" <= token[1:2] <= "9":
+            continue
+
+        # Read numbers up to the first non-digit character
+        requested_version = []
+        for part in token[1:].split(".", 2):
+            digits = part[:len(part) - len(part.lstrip(_DIGITS))]
+            if not digits:
+                break
+            requested_version.append(int(digits))
+            if digits != part:
+                break
+
+        # Force lowest minor/patch for most conservative compatibility
+        requested_version += [0] * (3 - len(requested_version))
+        return tuple(requested_version)
+    return installed_version
 
 
 # Execute the search for the import line
+# The result is cached, since the import chain does not change after import
+@lru_cache(maxsize=1)
 def _get_requested_version():
     """Returns the version requested by the import.
 
@@ -246,24 +377,34 @@ def _get_requested_version():
     except (KeyError, AttributeError):  # ignore interactive sessions
         return installed_version
 
+    _FILE_TO_NAME.update(
+        (m.__file__, n) for n, m in list(sys.modules.items())
+        if getattr(m, "__file__", None)
+    )
+
     # Abandon if no import line was found (can happen if the search depth
     # is too shallow, in which case we try to search a bit deeper each time)
     # We stop when we cannot find it with a depth of 3.
-    # TODO(2024-05-06):
-    #   Optimize this by ignoring known built-in and commonly-used libraries.
+    # Visited files are reset for each depth, while parsed files are
+    # reused to avoid repeated parsing.
     for max_depth in range(4):
+        SEARCHED_PATHS.clear()
         result = _search_importline(path_main, max_depth=max_depth)
         if result is not None:
             break
-    else:
-        logger.warn(f"'{TARGET_LIBRARY}' could not be found")
+    SEARCHED_PATHS.clear()  # clear space
+    _FILE_TO_NAME.clear()
+    _AST_CACHE.clear()
+    _read.cache_clear()
+    if result is None:
+        logger.warn(
+            f"'{TARGET_LIBRARY}' could not be found "
+            "(only module-level imports are searched)"
+        )
         return installed_version
 
-    # Import line found: read from file
-    module_name, path, lineno = result
-    with open(path, "r+") as file:
-        lines = file.readlines()
-        targetline = lines[lineno-1].rstrip("\n")
+    # Import line found: already read during search
+    module_name, path, lineno, targetline = result
 
     # Feedback to user importing results
     # The stated version number is used regardless, for use in editable
@@ -288,9 +429,31 @@ def _get_requested_version():
     )
     return requested_version
 
-requested_version = _get_requested_version()
-__kochen_requested_version = requested_version
-del SEARCHED_MODULES  # clear space
+def _get_req():
+    """Returns requested version, performing the search on first call.
+
+    The search is deferred until the requested version is first needed,
+    i.e. when a versioned function is defined or 'requested_version' is
+    accessed, so that importing the library alone stays cheap.
+    """
+    global requested_version
+    if (_requested_version := globals().get("requested_version")) is not None:
+        return _requested_version
+
+    # Search can be disabled with 'KOCHEN_VERSION_SEARCH=0' for processes that
+    # do not rely on pinned versions. Interactive sessions without a main
+    # script are handled by '_get_requested_version'.
+    if os.environ.get("KOCHEN_VERSION_SEARCH", "1") != "0":
+        requested_version = _get_requested_version()
+    else:
+        requested_version = installed_version
+    return requested_version
+
+def __getattr__(name):
+    """Resolves 'requested_version' lazily, see PEP562."""
+    if name == "requested_version":
+        return _get_req()
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
 
 
@@ -302,6 +465,53 @@ del SEARCHED_MODULES  # clear space
 # TODO: See how to reduce memory usage
 __kochen_f_cache = {}  # store latest compatible version on reference
 __kochen_f_refmap = {}
+__kochen_f_versions = {}  # sorted versions per function, built on lookup
+
+def _register(f, version_tuple, namespace, ns_refmap):
+    """Stores function under specified version, for use by 'version'.
+
+    'ns_refmap' is the references dictionary of the namespace, passed
+    directly to avoid the lookup by namespace.
+    """
+    # Cache function in loader for dynamic calls
+    fname = f.__name__
+
+    # Store all versioned functions
+    fmap = ns_refmap.setdefault(fname, {})
+    fmap[version_tuple] = f
+    __kochen_f_versions.pop((namespace, fname), None)  # invalidate
+    return f
+
+def _register_compatible(f, version_tuple, namespace, ns_refmap, ns_cache):
+    """Stores function and caches it as the latest compatible function.
+
+    Only used for versions not newer than the requested version. 'ns_cache'
+    is the cache dictionary of the namespace.
+    """
+    _register(f, version_tuple, namespace, ns_refmap)
+
+    # Cache latest compatible function
+    fname = f.__name__
+    _, prev_ver = ns_cache.setdefault(fname, (f, version_tuple))
+    if version_tuple > prev_ver:
+        ns_cache[fname] = (f, version_tuple)  # override with later
+    return f
+
+def _version(version_str, namespace, ns_refmap, ns_cache):
+    """Returns decorator for 'version', with namespace dictionaries resolved."""
+    # Bind version tuple to the shared registrar, instead of creating a new
+    # closure for every decorated function. Compatibility with the requested
+    # version is resolved once here, rather than during registration.
+    version_tuple = _version_str2tuple(version_str)
+    if version_tuple <= _get_req():
+        return partial(
+            _register_compatible, version_tuple=version_tuple,
+            namespace=namespace, ns_refmap=ns_refmap, ns_cache=ns_cache,
+        )
+    return partial(
+        _register, version_tuple=version_tuple,
+        namespace=namespace, ns_refmap=ns_refmap,
+    )
 
 def version(version_str: str, namespace: Optional[str] = None):
     """Decorator for indicating version of a function.
@@ -320,27 +530,9 @@ def version(version_str: str, namespace: Optional[str] = None):
     TODO:
         See how to extend this to other libraries.
     """
-    # Convert to version tuple
-    version_tuple = _version_str2tuple(version_str)
-
-    def helper(f):
-        # Cache function in loader for dynamic calls
-        fname = f.__name__
-
-        # Store all versioned functions
-        ns = __kochen_f_refmap.setdefault(namespace, {})
-        fmap = ns.setdefault(fname, SortedDict())
-        fmap[version_tuple] = f
-
-        # Cache latest compatible function
-        if version_tuple <= __kochen_requested_version:
-            ns = __kochen_f_cache.setdefault(namespace, {})
-            _, prev_ver = ns.setdefault(fname, (f, version_tuple))
-            if version_tuple > prev_ver:
-                ns[fname] = (f, version_tuple)  # override with later
-
-        return f
-    return helper
+    ns_refmap = __kochen_f_refmap.setdefault(namespace, {})
+    ns_cache = __kochen_f_cache.setdefault(namespace, {})
+    return _version(version_str, namespace, ns_refmap, ns_cache)
 
 # Cache reference to 'version' internally within 'versioning.py'
 # This assignment necessary to avoid conflicts with global 'version'
@@ -354,8 +546,19 @@ def mock_version(version_str, namespace=None):
     return helper
 
 def get_namespace_version(namespace):
-    """Returns 'version' with a fixed namespace, for module-wide versioning."""
-    return partial(__kochen_version, namespace=namespace)
+    """Returns 'version' with a fixed namespace, for module-wide versioning.
+
+    The namespace dictionaries are resolved once here, so that decorations
+    skip the lookup by namespace.
+    """
+    if namespace is not None:
+        namespace = sys.intern(namespace)
+    ns_refmap = __kochen_f_refmap.setdefault(namespace, {})
+    ns_cache = __kochen_f_cache.setdefault(namespace, {})
+
+    def namespace_version(version_str):
+        return _version(version_str, namespace, ns_refmap, ns_cache)
+    return namespace_version
 
 def cleanup(globals_ref, namespace=None):
     """Clears function references from namespace.
@@ -380,9 +583,8 @@ def cleanup(globals_ref, namespace=None):
         return
     if (ns := __kochen_f_refmap.get(namespace)) is None:
         return
-    for fname in ns.keys():
-        if fname in globals_ref:
-            globals_ref.pop(fname)
+    for fname in ns.keys() & globals_ref.keys():
+        del globals_ref[fname]
     return
 
 __kochen_cleanup = cleanup
@@ -398,7 +600,9 @@ def search(fname, namespace=None):
 __kochen_search = search
 
 def get_namespace_search(namespace):
-    return partial(__kochen_search, namespace=namespace)
+    def namespace_search(fname):
+        return __kochen_search(fname, namespace=namespace)
+    return namespace_search
 
 def get_namespace_versioning(namespace, globals_ref=None):
     """Convenience function.
@@ -422,20 +626,21 @@ def get_namespace_versioning(namespace, globals_ref=None):
     return version, cleanup, search
 
 def search_versioned(fname, version, namespace=None):
-    """Returns desired function cached."""
-    # Check if function already cached
-    if fname in __kochen_f_cache:
-        return __kochen_f_cache[fname]
-
-    # Search for function
-    __kochen_f_refmap = []
+    """Returns latest function compatible with the specified version tuple."""
     if (ns := __kochen_f_refmap.get(namespace)) is None \
             or (fmap := ns.get(fname)) is None:
         raise AttributeError(f"'{fname}' is not versioned/does not exist.")
 
-    # TODO: Pull relevant version
-    # 'fmap' is effectively a set of version numbers
-    idx = fmap.bisect_right(version) - 1
-    found_version, f = fmap.peekitem(idx)
-    __kochen_f_cache[fname] = f
-    return f
+    # Versions are sorted only on lookup, since the number of versions
+    # per function is small and lookups are rare
+    key = (namespace, fname)
+    if (versions := __kochen_f_versions.get(key)) is None:
+        versions = __kochen_f_versions[key] = sorted(fmap)
+    import bisect  # deferred since lookups are rare
+    idx = bisect.bisect_right(versions, version) - 1
+    if idx < 0:
+        raise AttributeError(
+            f"'{fname}' has no version compatible with "
+            f"'{_version_tuple2str(version)}'."
+        )
+    return fmap[versions[idx]]
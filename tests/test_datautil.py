@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+
+from kochen.datautil import filecache
+
+class TestFilecache:
+
+    def test_cached(self):
+        calls = []
+        @filecache
+        def f(x):
+            calls.append(x)
+            return {"value": x}
+
+        with tempfile.TemporaryDirectory() as d:
+            cache = os.path.join(d, "cache.json")
+            assert f(4, cache=cache) == {"value": 4}
+            assert f(4, cache=cache) == {"value": 4}
+            assert calls == [4]
+
+    def test_mutation_not_cached(self):
+        @filecache
+        def f():
+            return {"values": [1, 2]}
+
+        with tempfile.TemporaryDirectory() as d:
+            cache = os.path.join(d, "cache.json")
+            f(cache=cache)
+            result = f(cache=cache)
+            result["values"].append(3)
+            assert f(cache=cache) == {"values": [1, 2]}
+
+    def test_rewritten_file(self):
+        @filecache
+        def f():
+            return {"value": 1}
+
+        with tempfile.TemporaryDirectory() as d:
+            cache = os.path.join(d, "cache.json")
+            assert f(cache=cache) == {"value": 1}
+
+            # Rewrite within the same timestamp tick, e.g. on FAT filesystems
+            stat = os.stat(cache)
+            with open(cache, "w") as file:
+                json.dump({"value": 100}, file)
+            os.utime(cache, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            assert f(cache=cache) == {"value": 100}
+
+    def test_deleted_file(self):
+        calls = []
+        @filecache
+        def f():
+            calls.append(None)
+            return {"value": 1}
+
+        with tempfile.TemporaryDirectory() as d:
+            cache = os.path.join(d, "cache.json")
+            f(cache=cache)
+            os.remove(cache)
+            assert f(cache=cache) == {"value": 1}
+            assert len(calls) == 2
+            assert os.path.exists(cache)
@@ -0,0 +1,18 @@
+import numpy as np
+
+from kochen.devices.motor.motordriver import MotorController
+
+class TestMotorConversions:
+
+    def setup_method(self):
+        self.motor = MotorController(None, 1, 4800)
+
+    def test_scalar(self):
+        assert self.motor.deg2step(90) == 1200
+        assert self.motor.deg2step(450) == 1200
+        assert self.motor.step2deg(1200) == 90.0
+
+    def test_array(self):
+        assert self.motor.deg2step(np.array(90)) == 1200
+        steps = np.array([0, 1200, 2400])
+        assert np.allclose(self.motor.step2deg(steps), [0, 90, 180])
@@ -0,0 +1,57 @@
+import os
+import pathlib
+import tempfile
+
+import pytest
+
+from kochen.scriptutil import guarantee_paths
+
+class TestGuaranteePaths:
+
+    def test_existing(self):
+        with tempfile.TemporaryDirectory() as d:
+            d = pathlib.Path(d)
+            (d / "file").touch()
+            (d / "dir").mkdir()
+            assert guarantee_paths([d / "file"], "f") == [d / "file"]
+            assert guarantee_paths([d / "dir"], "d") == [d / "dir"]
+            assert guarantee_paths([d / "file", d / "dir"]) == [d / "file", d / "dir"]
+
+    def test_missing_file_created(self):
+        with tempfile.TemporaryDirectory() as d:
+            d = pathlib.Path(d)
+            (d / "existing").touch()
+            paths = guarantee_paths([d / "existing", str(d / "new")], "f")
+            assert paths == [d / "existing", d / "new"]
+            assert (d / "new").is_file()
+
+    def test_missing_without_type(self):
+        with tempfile.TemporaryDirectory() as d:
+            with pytest.raises(ValueError):
+                guarantee_paths([pathlib.Path(d) / "missing"])
+
+    def test_symlink(self):
+        with tempfile.TemporaryDirectory() as d:
+            d = pathlib.Path(d)
+            (d / "dir").mkdir()
+            os.symlink(d / "dir", d / "link")
+            assert guarantee_paths([d / "link"], "d") == [d / "link"]
+            with pytest.raises(ValueError):
+                guarantee_paths([d / "link"], "f")
+
+    def test_type_mismatch(self):
+        with tempfile.TemporaryDirectory() as d:
+            d = pathlib.Path(d)
+            (d / "file").touch()
+            (d / "dir").mkdir()
+            with pytest.raises(ValueError):
+                guarantee_paths([d / "file"], "d")
+            with pytest.raises(ValueError):
+                guarantee_paths([d / "dir"], "f")
+
+    def test_missing_parent(self):
+        with tempfile.TemporaryDirectory() as d:
+            d = pathlib.Path(d)
+            paths = guarantee_paths([d / "a" / "b" / "file"], "f")
+            assert paths == [d / "a" / "b" / "file"]
+            assert paths[0].is_file()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+
+from kochen.versioning import _parse_importline, _search_importline, _version_str2tuple
+
+INSTALLED = (0, 2024, 4)
+
+class TestVersionParsing:
+
+    def test_pinned(self):
+        line = "import kochen  # v0.10.20"
+        assert _parse_importline(line, INSTALLED) == _version_str2tuple("0.10.20")
+
+    def test_pinned_partial(self):
+        assert _parse_importline("import kochen  # v2", INSTALLED) == (2, 0, 0)
+        assert _parse_importline("from kochen import x  # v0.2024.1", INSTALLED) == (0, 2024, 1)
+
+    def test_unpinned(self):
+        assert _parse_importline("import kochen", INSTALLED) == INSTALLED
+        assert _parse_importline("import kochen  # @#&!;", INSTALLED) == INSTALLED
+        assert _parse_importline("import kochen  # version", INSTALLED) == INSTALLED
+
+class TestImportlineSearch:
+
+    def search(self, source):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "main.py")
+            with open(path, "w") as f:
+                f.write(source)
+            _, _, lineno, line = _search_importline(path, max_depth=0)
+        return lineno, line
+
+    def test_direct(self):
+        assert self.search("import kochen  # v0.2024.1\n") == (1, "import kochen  # v0.2024.1")
+
+    def test_docstring_example_ignored(self):
+        source = (
+            '"""Example:\n'
+            '    import kochen  # v0.2024.1\n'
+            '"""\n'
+            'import kochen.common  # v2.0\n'
+        )
+        assert self.search(source) == (4, "import kochen.common  # v2.0")
+
+    def test_function_import_ignored(self):
+        source = (
+            "def f():\n"
+            "    import kochen  # v0.2024.1\n"
+            "import kochen.common  # v2.0\n"
+        )
+        assert self.search(source) == (3, "import kochen.common  # v2.0")
@@ -0,0 +1,40 @@
+import pytest
+
+from kochen.versioning import search_versioned, version
+
+NAMESPACE = "tests.test_versioning_search"
+
+def register(version_str, fname="f", namespace=NAMESPACE):
+    def f():
+        return version_str
+    f.__name__ = fname
+    return version(version_str, namespace)(f)
+
+class TestSearchVersioned:
+
+    def test_exact(self):
+        register("0.1.0", "exact")
+        register("0.3.0", "exact")
+        assert search_versioned("exact", (0, 1, 0), NAMESPACE)() == "0.1.0"
+        assert search_versioned("exact", (0, 3, 0), NAMESPACE)() == "0.3.0"
+
+    def test_between(self):
+        register("0.1.0", "between")
+        register("0.3.0", "between")
+        assert search_versioned("between", (0, 2, 5), NAMESPACE)() == "0.1.0"
+        assert search_versioned("between", (1, 0, 0), NAMESPACE)() == "0.3.0"
+
+    def test_older_than_all(self):
+        register("0.1.0", "older")
+        with pytest.raises(AttributeError):
+            search_versioned("older", (0, 0, 9), NAMESPACE)
+
+    def test_missing(self):
+        with pytest.raises(AttributeError):
+            search_versioned("missing", (0, 1, 0), NAMESPACE)
+
+    def test_register_after_lookup(self):
+        register("0.1.0", "later")
+        assert search_versioned("later", (0, 2, 0), NAMESPACE)() == "0.1.0"
+        register("0.2.0", "later")
+        assert search_versioned("later", (0, 2, 0), NAMESPACE)() == "0.2.0"